@@ -19,16 +19,74 @@ except:
 
 import os
 import numpy as np
-import xml.etree.ElementTree as ET
 from lxml import etree
 import sys
-from .OpenSMOG_Reporter import forcesReporter, stateReporter, SMOGMinimizationReporter
+from .OpenSMOG_Reporter import forcesReporter, stateReporter, bufferedReporter, flushReporter, SMOGMinimizationReporter
 import re as regex
 from pathlib import Path
 from .oscheck import SBMCHECK
 
+def _fill_tables(i_idx, j_idx, vals, out):
+    # Fill both triangles of the (parameter, type, type) tables in out with the (parameter, pair) values in vals.
+    # Returns the index of the first table entry that is still unset, or (-1,-1,-1) if all entries were given.
+    # Each pair is ordered first, so that if a pair is given more than once (in any order) the last entry is
+    # used for both cells and the tables stay symmetric
+    a=np.minimum(i_idx,j_idx)
+    b=np.maximum(i_idx,j_idx)
+    out[:,a,b]=vals
+    out[:,b,a]=vals
+    unset=np.argwhere(np.isnan(out))
+    if len(unset) != 0:
+        return tuple(unset[0])
+    return -1,-1,-1
+
+# parser for the xml and xsd files. huge_tree lifts the libxml2 limits that large contact files can reach, while
+# skipping xml:id collection and whitespace-only text nodes reduces the memory used by the parsed tree
+_xmlparser = etree.XMLParser(collect_ids=False, huge_tree=True, remove_blank_text=True)
+
+# compiled schemas, keyed by the path of the xsd file. Each entry holds the file modification time and the schema
+_xmlschema_cache = {}
+
+def _loadXmlSchema(xsdfile="share/OpenSMOG.xsd"):
+    # build the schema only once per session, unless the xsd file changes
+    pt = os.path.dirname(os.path.realpath(__file__))
+    xsdfile = os.path.join(pt,xsdfile)
+    mtime = os.path.getmtime(xsdfile)
+    if xsdfile in _xmlschema_cache and _xmlschema_cache[xsdfile][0] == mtime:
+        return _xmlschema_cache[xsdfile][1]
+    xmlschema_doc = etree.parse(xsdfile, _xmlparser)
+    xmlschema = etree.XMLSchema(xmlschema_doc)
+    _xmlschema_cache[xsdfile] = (mtime, xmlschema)
+    return xmlschema
+
+# simulation, input and output sections of the log file, written by SBM._createLogfile
+_LOGTEMPLATE = """
+Simulation Information:
+-----------------------
+Name: %s
+Time step: %s
+Collision Rate: %s
+r_cutoff: %s
+Temperature: %s
+Integrator: %s
+
+Input Files:
+------------
+GroFile: %s
+TopFile: %s
+XmlFile: %s
+
+Output Files:
+-------------
+Savefolder: %s
+"""
+
 class SBM:
     version="1.2"
+    # names of the OpenMM platforms, keyed by the lower-case names accepted by setup_openmm
+    _platformNames = {'opencl':'OpenCL', 'cuda':'CUDA', 'hip':'HIP', 'cpu':'CPU', 'reference':'Reference'}
+    # platforms that do not take the Precision/DeviceIndex properties
+    _noPropertyPlatforms = ('Reference', 'CPU')
     R"""  
     The :class:`~.SBM` class performs Molecular dynamics simulations using structure-based (SMOG) models to investigate a broad range of biomolecular dynamics, including domain rearrangements in proteins, folding and ligand binding in RNA and large-scale rearrangements in ribonucleoprotein assemblies. In its simplest form, a structure-based model defines a particular structure (usually obtained from X-ray, cryo-EM, or NMR methods) as the energetic global minimum. Find more information about SMOG models and OpenSMOG at http://smog-server.org 
     
@@ -37,14 +95,14 @@ class SBM:
     
         Args:
         
-            time_step (float, required):
+            time_step (float or Quantity, required):
                 Simulation time step in units of :math:`\tau`. 
-            collision_rate (float, required):
+            collision_rate (float or Quantity, required):
                 Friction/Damping constant in units of reciprocal time (:math:`1/\tau`).
-            r_cutoff (float, required):
+            r_cutoff (float or Quantity, required):
                 Cutoff distance to consider non-bonded interactions (nanometers).
-            temperature (float, required):
-                Temperature in reduced units 
+            temperature (float or Quantity, required):
+                Temperature in reduced units. If a Quantity is given, it must have units of temperature (kelvin), which are converted to reduced units.
             pbc (boolean, optional):
                 Turn PBC on/off. (Default value: :code:`False`)
             cmm (boolean, optional):
@@ -66,24 +124,31 @@ class SBM:
         self._folderpassed=True
         self._setuppassed=True
 
-        for n in ['temperature','r_cutoff','time_step','collision_rate']:
+        # units that each parameter may be given in, when it is given as a quantity
+        units={'temperature':kelvin,'r_cutoff':nanometers,'time_step':picoseconds,'collision_rate':picosecond**-1}
+        for n in units:
             v=vars()[n]
-            if v == None:
+            if v is None:
                 print('ERROR: {} is required.'.format(n))
                 sys.exit(1)
-            if not isinstance(v,(float,int)):
+            if not isinstance(v,(float,int)) and not is_quantity(v):
                 print('ERROR: {} must be a numeric value, found \'{}\'.'.format(n,v))
                 sys.exit(1)
+            if is_quantity(v) and not v.unit.is_compatible(units[n]):
+                print('ERROR: {} must have units compatible with {}, found \'{}\'.'.format(n,units[n],v))
+                sys.exit(1)
          
         self.name = name
         self.warn = warn
-        self.time_step=time_step
-        self.dt = time_step * picoseconds
+        # values that are already given as quantities are used as is. The plain values are kept for the checks and output below
+        self.dt = time_step if is_quantity(time_step) else time_step * picoseconds
+        self.time_step = time_step = self.dt.value_in_unit(picoseconds)
         self.started=0
         self.reporteradded=False
-        self.collision_rate=collision_rate
-        self.gamma = collision_rate / picosecond
-        self.rcutoff = r_cutoff * nanometers  
+        self.gamma = collision_rate if is_quantity(collision_rate) else collision_rate / picosecond
+        self.collision_rate = collision_rate = self.gamma.value_in_unit(picosecond**-1)
+        self.rcutoff = r_cutoff if is_quantity(r_cutoff) else r_cutoff * nanometers  
+        r_cutoff = self.rcutoff.value_in_unit(nanometers)
 
         if self.warn:
             if not time_step in [0.0005, 0.002]:
@@ -108,8 +173,12 @@ the default all-atom model. Depending on your model, other choices may
 be more appropriate.
 ''')
 		
-        self.temperature_reduced = temperature 
-        self.temperature = (temperature / 0.00831446261815) * kelvin
+        if is_quantity(temperature):
+            self.temperature = temperature
+            self.temperature_reduced = temperature.value_in_unit(kelvin) * 0.00831446261815
+        else:
+            self.temperature_reduced = temperature 
+            self.temperature = (temperature / 0.00831446261815) * kelvin
         self.loaded = False
         self.folder = "."
         self.forceCount = 0
@@ -128,6 +197,8 @@ be more appropriate.
         properties["Precision"] = 'single'
         self.properties = properties
         self.outputNames = []
+        # energy reporters that keep their output in memory, when createReporters is given a flushInterval
+        self._bufferedReporters = []
         self.logFileName = 'OpenSMOG.log'
         self.integratorname = False
         plats = []
@@ -527,20 +598,10 @@ To alleviate this instability, we allow one to truncate the Gaussian term at 4*s
                 print("Try rerunning setup_openmm again.")
                 return    
  
-            if platform.lower() == "opencl":
-                nametmp='OpenCL'
-            elif platform.lower() == "reference":
-                nametmp='Reference'
-                self.properties = {}
-            elif platform.lower() == "cuda":
-                nametmp='CUDA'
-            elif platform.lower() == "cpu":
-                nametmp='CPU'
+            # any other registered platform is requested by the name that was given
+            nametmp = SBM._platformNames.get(platform.lower(), platform)
+            if nametmp in SBM._noPropertyPlatforms:
                 self.properties = {}
-            elif platform.lower() == "hip":
-                nametmp='HIP'
-            else:
-                nametmp=platform
             
             self.platform = Platform.getPlatformByName(nametmp)
 
@@ -681,37 +742,30 @@ To alleviate this instability, we allow one to truncate the Gaussian term at 4*s
             print('This simulation will not use Periodic boundary conditions')
             self.Top = GromacsTopFile(Topfile)
             self.system = self.Top.createSystem(nonbondedMethod=CutoffNonPeriodic,nonbondedCutoff=self.rcutoff,removeCMMotion = self.cmm)
-        for force_id, force in enumerate(self.system.getForces()):  
+        forces = self.system.getForces()
+        # indices of the nonbonded forces from the top file. These are removed if the xml file defines the nonbonded terms
+        self._forcesToRemove = []
+        for force_id, force in enumerate(forces):  
             force.setForceGroup(force_id)
             self.forcesDict[force.__class__.__name__] = force
-            self.forceCount +=1
+            if isinstance(force, (NonbondedForce, CustomNonbondedForce)):
+                self._forcesToRemove.append(force_id)
+        self.forceCount += len(forces)
         
     def _splitForces_contacts(self):
         #Contacts
         cont_data=self.data['contacts']
-        n_forces =  len(cont_data[3])
-        forces = {}
-        for n in range(n_forces):
-            forces[cont_data[3][n]] = [cont_data[0][n], cont_data[1][n], cont_data[2][n]]
-        self.contacts = forces
+        self.contacts = {name:[expr,pars,pairs] for expr,pars,pairs,name in zip(*cont_data)}
 
     def _splitForces_nb(self):
-        #Contacts
+        #Nonbonded
         nb_data=self.data['nonbond']
-        n_forces =  len(nb_data[0])
-        forces = {}
-        for n in range(n_forces):
-            forces[nb_data[0][n]] = [nb_data[1][n], nb_data[2][n], nb_data[3][n]]
-        self.nonbond = forces
+        self.nonbond = {name:[expr,pars,nbpars] for name,expr,pars,nbpars in zip(*nb_data)}
 
     def _splitForces_dihedrals(self):
         #Custom Dihedrals
         dihedrals_data=self.data['dihedrals']
-        n_forces =  len(dihedrals_data[3])
-        forces = {}
-        for n in range(n_forces):
-            forces[dihedrals_data[3][n]] = [dihedrals_data[0][n], dihedrals_data[1][n], dihedrals_data[2][n]]
-        self.dihedrals = forces
+        self.dihedrals = {name:[expr,pars,ijkl] for expr,pars,ijkl,name in zip(*dihedrals_data)}
 
     def _customSmogForce(self, name, data, pbc):
         #first set the equation
@@ -725,12 +779,10 @@ To alleviate this instability, we allow one to truncate the Gaussian term at 4*s
         #third, apply the bonds from each pair of atoms and the related variables.
         pars = [pars for pars in data[1]]
 
+        # bind addBond once, since it is called for every contact
+        addBond = contacts_ff.addBond
         for iteraction in data[2]:
-            atom_index_i = int(iteraction['i'])-1 
-            atom_index_j = int(iteraction['j'])-1
-            parameters = [float(iteraction[k]) for k in pars]
-
-            contacts_ff.addBond(atom_index_i, atom_index_j, parameters)
+            addBond(int(iteraction['i'])-1, int(iteraction['j'])-1, [float(iteraction[k]) for k in pars])
         #forth, if the are global variables, add them to the force
         if self.constants_present==True:
             for const_key in self.data['constants']:
@@ -780,48 +832,47 @@ To alleviate this instability, we allow one to truncate the Gaussian term at 4*s
         #Add cutoff as global parameter
         nonbond_ff.addGlobalParameter('r_c',self.rcutoff.value_in_unit(nanometer))
 
-        #Load old nonbonded force for later use
-        original_nonbonded=self.system.getForce(0)
-        original_customnonbonded=self.system.getForce(1)
+        #Load old nonbonded forces for later use. These are the top file forces recorded by loadTop, which are removed afterwards
+        for force_id in self._forcesToRemove:
+            force=self.system.getForce(force_id)
+            if isinstance(force, CustomNonbondedForce):
+                original_customnonbonded=force
+            else:
+                original_nonbonded=force
 
         #Get atoms types and number of types
-        atom_types=[]
-        for i in range(len(data[2])):
-            atom_types.append(data[2][i]['type1'])
-            atom_types.append(data[2][i]['type2'])
-        self.atom_types=np.unique(np.array(atom_types))
-        natom_types=len(self.atom_types)
-        #Generate tables for each parameter
-        tables={}
-        for par in data[1]:
-            tables[par]=np.ones([natom_types,natom_types])*np.nan
-        #Fill tables with nonbond_param
+        type1=[]
+        type2=[]
+        values={par:[] for par in data[1]}
         for nonbond_params in data[2]:
-            #Get atoms id (name to number)
-            type1=np.where(self.atom_types==nonbond_params['type1'])[0][0]
-            type2=np.where(self.atom_types==nonbond_params['type2'])[0][0]
-            for par in tables:
-                tables[par][type1][type2]=nonbond_params[par]
-                tables[par][type2][type1]=nonbond_params[par]    
-
-        missing={}
-        #Generate Function from tables
-        table_fun={}
-        for par in data[1]:
-            #Check none have nans
-            if np.sum(np.isnan(tables[par]))!=0:
-                en=np.argwhere(np.isnan(tables[par]))
-                pairs=""
-                for i in en:
+            type1.append(nonbond_params['type1'])
+            type2.append(nonbond_params['type2'])
+            for par in values:
+                values[par].append(float(nonbond_params[par]))
+        # there are only a few distinct types, so find them by hashing and only sort the unique names
+        uniq=list(dict.fromkeys(type1+type2))
+        uniq.sort()
+        self.atom_types=np.array(uniq)
+        natom_types=len(self.atom_types)
+        # row/column of each type name in the tables. All names are in self.atom_types, so searchsorted gives their exact positions
+        i_idx=np.searchsorted(self.atom_types,np.array(type1))
+        j_idx=np.searchsorted(self.atom_types,np.array(type2))
+        #Generate and fill tables for each parameter
+        vals=np.array([values[par] for par in data[1]],dtype=np.float64)
+        # a C-contiguous float64 array, so that each table flattens to a list of floats without a copy
+        tables=np.full((len(data[1]),natom_types,natom_types),np.nan,dtype=np.float64)
+        unset=_fill_tables(i_idx,j_idx,vals,tables)
+        #Check none have nans
+        if unset[0] >= 0:
+            missing={}
+            for p,par in enumerate(data[1]):
+                for i in np.argwhere(np.isnan(tables[p])):
                     if i[0] <= i[1]:
                         stri=str(i[0])+","+str(i[1])
                         if stri in missing:
-                            missing[str(stri)].append(par)
+                            missing[stri].append(par)
                         else:
-                            missing[str(stri)]=[par] 
-            table_fun[par]=Discrete2DFunction(natom_types,natom_types,list(np.ravel(tables[par])))
-            nonbond_ff.addTabulatedFunction(par,table_fun[par])
-        if len(missing) != 0:
+                            missing[stri]=[par] 
             message=""
             for i in missing.keys():
                 j=i.split(",")
@@ -832,40 +883,47 @@ To alleviate this instability, we allow one to truncate the Gaussian term at 4*s
                     message=message+j+" "
                 message=message+"\n"
             SBM.opensmog_quit('XML file error:\n Atom-type pairs are missing the following parameters\n{}'.format(message))
+        #Generate Function from tables
+        table_fun={}
+        for p,par in enumerate(data[1]):
+            table_fun[par]=Discrete2DFunction(natom_types,natom_types,tables[p].ravel().tolist())
+            nonbond_ff.addTabulatedFunction(par,table_fun[par])
         #Get exceptions from topfile import
+        getExclusionParticles=original_customnonbonded.getExclusionParticles
+        addExclusion=nonbond_ff.addExclusion
         for i in range(original_customnonbonded.getNumExclusions()):
-            exclusion_id = original_customnonbonded.getExclusionParticles(i)
-            nonbond_ff.addExclusion(exclusion_id[0],exclusion_id[1])
+            exclusion_id = getExclusionParticles(i)
+            addExclusion(exclusion_id[0],exclusion_id[1])
         ## ADD PARTICLES TO THE FORCE BASED ON SPECIFYING TYPE AND CHARGE
         ## CHARGES
         ## From nonbondedforce we get the charges for each atom
-        atom_charges=[]
-        ## Loop over every atom
-        for i in range(self.system.getNumParticles()):
-            atom_charge=original_nonbonded.getParticleParameters(i)[0]
-            atom_charges.append(atom_charge.value_in_unit(constants.elementary_charge))
+        nparticles=self.system.getNumParticles()
+        atom_charges=np.empty(nparticles,dtype=np.float64)
+        ## Loop over every atom. Bind the method and unit locally, since this is called once per atom
+        getParticleParameters=original_nonbonded.getParticleParameters
+        charge_unit=constants.elementary_charge
+        for i in range(nparticles):
+            atom_charges[i]=getParticleParameters(i)[0].value_in_unit(charge_unit)
         ## ATOM TYPES
         ## From molecule information we get atom types
         atom_types=[]
-        ## Get name and multiplicity of each molecule
-        molecules_keys=[self.Top._molecules[i][0] for i in range(len(self.Top._molecules)) ]
-        molecules_mul=[self.Top._molecules[i][1] for i in range(len(self.Top._molecules)) ]
-        ## Loop over molecules
-        for i in range(len(molecules_keys)):
-            molecule=molecules_keys[i]
-            mult=molecules_mul[i]
-            # Loop over atoms in each molecule
-            for _ in range(mult):
-                # If multiple copies of a molecule are defined in the system (in the top file), then include the atoms in that molecule multiple times. (CL,CL,CL,... or MG,MG,MG,... or CA, CB, CA, CB, CA, CB...). Notes, these two for loops were improperly nested in versions 1.1.1 and earlier
-                for atom in self.Top._moleculeTypes[molecule].atoms:
-                    atom_types.append(atom[1])
-        for i in range(self.system.getNumParticles()):
-            # GET ATOM TYPE
-            at_type=np.where(atom_types[i]==self.atom_types)[0][0]
-            # GET ATOM CHARGE
-            charge=atom_charges[i]
+        moleculeTypes=self.Top._moleculeTypes
+        ## Loop over the name and multiplicity of each molecule
+        for molecule,mult in self.Top._molecules:
+            # If multiple copies of a molecule are defined in the system (in the top file), then include the atoms in that molecule multiple times. (CL,CL,CL,... or MG,MG,MG,... or CA, CB, CA, CB, CA, CB...). Notes, the loops over copies and atoms were improperly nested in versions 1.1.1 and earlier
+            molecule_types=np.array([atom[1] for atom in moleculeTypes[molecule].atoms],dtype=str)
+            atom_types.append(np.tile(molecule_types,mult))
+        atom_types=np.concatenate(atom_types)
+        # self.atom_types is sorted, so the index of each type in the tables can be found for all atoms at once
+        at_type_arr=np.searchsorted(self.atom_types,atom_types)
+        # searchsorted only gives the insertion point, so check that each type is actually listed in the xml file
+        unknown=self.atom_types[np.minimum(at_type_arr,natom_types-1)] != atom_types
+        if unknown.any():
+            SBM.opensmog_quit('XML file error:\n Atom type(s) {} are used in the top file, but no nonbond_param entries are given for them in the xml file.'.format(" ".join(np.unique(atom_types[unknown]))))
+        addParticle=nonbond_ff.addParticle
+        for charge,at_type in zip(atom_charges.tolist(),at_type_arr.tolist()):
             # ADD PARTICLE TO EACH FORCE WITH CORRESPONDING CHARGE AND TYPE
-            nonbond_ff.addParticle([charge,at_type])
+            addParticle([charge,at_type])
         #Set cutoff and nonbonded method
         if self.pbc == True:
             nonbond_ff.setNonbondedMethod(NonbondedForce.CutoffPeriodic)
@@ -874,9 +932,11 @@ To alleviate this instability, we allow one to truncate the Gaussian term at 4*s
 
         nonbond_ff.setCutoffDistance(self.rcutoff.value_in_unit(nanometer))
 
-        self.forcesDict['Nonbonded'+str(name)] =  nonbond_ff
+        key = f"Nonbonded{name}"
+        self.forcesDict[key] =  nonbond_ff
         nonbond_ff.setForceGroup(self.forceCount)
         self.forceCount +=1
+        return key
 
     def loadXml(self, Xmlfile):
         R"""Loads the  *.xml* file format in the OpenMM system platform. The input files are generated using SMOG2 software with the flag :code:`-OpenSMOG`. Details on how to create the files can be found in the `SMOG2 User Manual <https://smog-server.org/smog2/>`__.
@@ -888,47 +948,28 @@ To alleviate this instability, we allow one to truncate the Gaussian term at 4*s
         """
 
         print("Will try to load OpenSMOG-specific force field terms from {}".format(Xmlfile))
-        def validate(Xmlfile):
-            xsdfile = "share/OpenSMOG.xsd"
-            pt = os.path.dirname(os.path.realpath(__file__))
-            xsdfile = os.path.join(pt,xsdfile)
-
-            xmlschema_doc = etree.parse(xsdfile)
-            xmlschema = etree.XMLSchema(xmlschema_doc)
+        def parse_and_validate(Xmlfile):
+            # parse the file once. The same tree is checked against the schema and then read by import_xml2OpenSMOG
+            xmlschema = _loadXmlSchema()
 
             if not os.path.exists(Xmlfile):
                 SBM.opensmog_quit("Could not find XML file {}".format(Xmlfile))
             try:
-                xml_doc = etree.parse(Xmlfile)
+                xml_doc = etree.parse(Xmlfile, _xmlparser)
             except Exception as mess:
                 SBM.opensmog_quit("Parsing of xml file \""+Xmlfile+"\" failed.  This usually occurs from a user unintentionally editing a line. \n\nXML ERROR:\n"+str(mess))
 
-            result = xmlschema.validate(xml_doc)
-            log = xmlschema.error_log
-            return result,log
+            if not xmlschema.validate(xml_doc):
+                log = xmlschema.error_log
+                SBM.opensmog_quit("The OpenSMOG xml file \""+Xmlfile+"\" does not adhere to the required schema. Check the end of this message for common causes of this error.\n\n  Detailed schema issue:\n"+str(log)+"\n\n  THE MOST COMMON CAUSES OF THIS ERROR ARE:\n    - You are using a version of SMOG 2 that is newer than this version of OpenSMOG. While force fields generated by older versions of SMOG 2 can be used with newer versions of OpenSMOG, the reverse is generally not possible. Try using the most recently released versions of both tools (or current git versions of both).\n    - Your xml file was corrupted. This can occur if you manually changed it, there was a file transfer error, or SMOG 2 crashed during writing.")
+            return xml_doc
 
-        def import_xml2OpenSMOG(file_xml):
-            XML_potential = ET.parse(file_xml)
-            root = XML_potential.getroot()
+        def import_xml2OpenSMOG(xml_tree):
             xml_data={}
-            if 'OpenSMOGversion' in root.attrib:
-                OSv=root.attrib['OpenSMOGversion']
-                if OSv != SBM.version:
-                    print("WARNING: You are using OpenSMOG v{}, but the input SMOG2-generated XML file indidates that it is for use with v{}. You may want to use the current versions of OpenSMOG and SMOG 2.\n".format(SBM.version,OSv)) 
-            else:
-                print('WARNING: No OpenSMOG version listed in the XML file.  This probably means it was generated with a version of SMOG 2 that is earlier than 2.4.6. Your XML file should still be compatible with this version of OpenSMOG, but you may want to update your version of SMOG 2.')
-
-
 
             ## Constants
             self.constants_present=False
-            if root.find('constants') != None:
-                self.constants_present=True
-                constants={}
-                constants_xml = root.find('constants')
-                for const in constants_xml.iter('constant'):
-                    constants[const.attrib['name']]=float(const.attrib['value'])
-                xml_data['constants']=constants
+            constants={}
 
             ## Contacts 
             Force_Names=[]
@@ -936,7 +977,109 @@ To alleviate this instability, we allow one to truncate the Gaussian term at 4*s
             Parameters=[]
             Pairs=[]
             self.contacts_present=False
-            if root.find('contacts') == None:
+
+            ## Nonbonded
+            self.nonbond_present=False
+            NonBond_Num=[]
+            NBExpression=[]
+            NBExpressionParameters=[]
+            NBParameters=[]
+            NBCutoff=[]
+
+            ## Custom Dihedrals 
+            CDForce_Names=[]
+            CDExpression=[]
+            CDParameters=[]
+            ijkl=[]
+            self.dihedrals_present=False
+
+            # expression, parameter and interaction/nonbond_param entries are routed to the lists of their parent
+            groups={'contacts_type':(Expression,Parameters,Pairs),
+                    'nonbond_bytype':(NBExpression,NBExpressionParameters,NBParameters),
+                    'dihedrals_type':(CDExpression,CDParameters,ijkl)}
+
+            def start_constants(elem):
+                self.constants_present=True
+
+            def start_contacts(elem):
+                self.contacts_present=True
+
+            def start_nonbond(elem):
+                self.nonbond_present=True
+
+            def start_dihedrals(elem):
+                self.dihedrals_present=True
+
+            def start_contacts_type(elem):
+                name=elem.attrib['name']
+                if name in Force_Names:
+                    SBM.opensmog_quit("contacts_type name \""+name+"\" is used more than once in the OpenSMOG xml file.  The name of each contacts_type must be unique.")
+                Force_Names.append(name)
+                Parameters.append([])
+                Pairs.append([])
+
+            def start_nonbond_bytype(elem):
+                NonBond_Num.append(len(NBParameters))
+                NBExpressionParameters.append([])
+                NBParameters.append([])
+
+            def start_dihedrals_type(elem):
+                name=elem.attrib['name']
+                if name in CDForce_Names:
+                    SBM.opensmog_quit("XML input error: dihedrals_type name \""+name+"\" is used more than once in the OpenSMOG xml file.  The name of each dihedrals_type must be unique.")
+                CDForce_Names.append(name)
+                CDParameters.append([])
+                ijkl.append([])
+
+            def end_constant(elem):
+                constants[elem.attrib['name']]=float(elem.attrib['value'])
+
+            def end_cutoff(elem):
+                NBCutoff.append(elem.attrib['distance'])
+
+            def end_expression(elem):
+                groups[elem.getparent().tag][0].append(elem.attrib['expr'])
+
+            def end_parameter(elem):
+                groups[elem.getparent().tag][1][-1].append(elem.text)
+
+            def end_interaction(elem):
+                # copy the attributes into a plain dict, so that the data does not hold on to the parsed tree
+                groups[elem.getparent().tag][2][-1].append(dict(elem.attrib))
+
+            handlers={('start','constants'):start_constants,
+                      ('start','contacts'):start_contacts,
+                      ('start','nonbond'):start_nonbond,
+                      ('start','dihedrals'):start_dihedrals,
+                      ('start','contacts_type'):start_contacts_type,
+                      ('start','nonbond_bytype'):start_nonbond_bytype,
+                      ('start','dihedrals_type'):start_dihedrals_type,
+                      ('end','constant'):end_constant,
+                      ('end','cutoff'):end_cutoff,
+                      ('end','expression'):end_expression,
+                      ('end','parameter'):end_parameter,
+                      ('end','interaction'):end_interaction,
+                      ('end','nonbond_param'):end_interaction}
+
+            # walk through the validated document once. The tree is only read, not changed
+            tags=set(tag for event,tag in handlers)
+            for event,elem in etree.iterwalk(xml_tree,events=('start','end'),tag=tags):
+                handler=handlers.get((event,elem.tag))
+                if handler is not None:
+                    handler(elem)
+            root=xml_tree.getroot()
+
+            if 'OpenSMOGversion' in root.attrib:
+                OSv=root.attrib['OpenSMOGversion']
+                if OSv != SBM.version:
+                    print("WARNING: You are using OpenSMOG v{}, but the input SMOG2-generated XML file indidates that it is for use with v{}. You may want to use the current versions of OpenSMOG and SMOG 2.\n".format(SBM.version,OSv)) 
+            else:
+                print('WARNING: No OpenSMOG version listed in the XML file.  This probably means it was generated with a version of SMOG 2 that is earlier than 2.4.6. Your XML file should still be compatible with this version of OpenSMOG, but you may want to update your version of SMOG 2.')
+
+            if self.constants_present:
+                xml_data['constants']=constants
+
+            if not self.contacts_present:
                 print('''
 No contacts were found in the xml file. This likely means your
 system does not have contacts, your contacts are defined in 
@@ -949,33 +1092,9 @@ it was flagged.
 Contacts found in the xml file.  Will include definitions
 provided in the top and xml files.
 ''')
-                self.contacts_present=True
-                contacts_xml=root.find('contacts')
-                for i in range(len(contacts_xml)):
-                    for name in contacts_xml[i].iter('contacts_type'):
-                        if name.attrib['name'] in Force_Names:
-                            SBM.opensmog_quit("contacts_type name \""+name.attrib['name']+"\" is used more than once in the OpenSMOG xml file.  The name of each contacts_type must be unique.")
-                        Force_Names.append(name.attrib['name'])
-
-                    for expr in contacts_xml[i].iter('expression'):
-                        Expression.append(expr.attrib['expr'])
-                        
-
-                    internal_Param=[]
-                    for par in contacts_xml[i].iter('parameter'):
-                        internal_Param.append(par.text)
-                    Parameters.append(internal_Param)
-
-                    internal_Pairs=[]
-                    for atompairs in contacts_xml[i].iter('interaction'):
-                            internal_Pairs.append(atompairs.attrib)
-                    Pairs.append(internal_Pairs)
-
                 xml_data['contacts']=[Expression,Parameters,Pairs,Force_Names]
 
-            #Launch contact force function
-            self.nonbond_present=False
-            if root.find('nonbond') == None:
+            if not self.nonbond_present:
                 print('''
 Nonbonded parameters not found in XML file.  Will
 only use information nonbonded parameters that
@@ -986,41 +1105,12 @@ are provided in the top file.
 Nonbonded parameters found in XML file. Nonbonded
 parameters in top file will be ignored.
 ''') 
-                self.nonbond_present=True
-                nonbond_xml=root.find('nonbond')
-                NonBond_Num=[]
-                NBExpression=[]
-                NBExpressionParameters=[]
-                NBParameters=[]
-                nonbond_xml=root.find('nonbond')
-                for i in range(len(nonbond_xml)):
-                    for cut in nonbond_xml[i].iter('cutoff'):
-                        cutoff=cut.attrib['distance']
-                        print("\nMODEL-SPECIFIC CUTOFF VALUE FOUND IN XML FILE!!!!\nWILL SET NON-BONDED CUTOFF TO {} nm\n".format(cutoff))
-                        self.rcutoff=float(cutoff) * nanometer
-                    for types in nonbond_xml[i].iter('nonbond_bytype'):
-                        NonBond_Num.append(i)
-                    for expr in nonbond_xml[i].iter('expression'):
-                        NBExpression.append(expr.attrib['expr'])
-                    internal_Param=[]
-                    for par in nonbond_xml[i].iter('parameter'):
-                        internal_Param.append(par.text)
-                    NBExpressionParameters.append(internal_Param)
-                    internal_NBParam=[]
-                    for nbpar in nonbond_xml[i].iter('nonbond_param'):
-                        internal_NBParam.append(nbpar.attrib)
-                    NBParameters.append(internal_NBParam)
+                for cutoff in NBCutoff:
+                    print("\nMODEL-SPECIFIC CUTOFF VALUE FOUND IN XML FILE!!!!\nWILL SET NON-BONDED CUTOFF TO {} nm\n".format(cutoff))
+                    self.rcutoff=float(cutoff) * nanometer
                 xml_data['nonbond']=[NonBond_Num,NBExpression,NBExpressionParameters,NBParameters]
 
-
-            ## Custom Dihedrals 
-            CDForce_Names=[]
-            CDExpression=[]
-            CDParameters=[]
-            ijkl=[]
-            
-            self.dihedrals_present=False
-            if root.find('dihedrals') == None:
+            if not self.dihedrals_present:
                 print('''
 Dihedral definitions not found in XML file. Will only 
 use dihedral information provided in the top file.
@@ -1030,36 +1120,11 @@ use dihedral information provided in the top file.
 Dihedral definitions found in XML file. Will include 
 dihedral information provided in the top and xml files.
 ''')
-                self.dihedrals_present=True
-                dihedrals_xml=root.find('dihedrals')
-                for i in range(len(dihedrals_xml)):
-                    for name in dihedrals_xml[i].iter('dihedrals_type'):
-                        if name.attrib['name'] in CDForce_Names:
-                            SBM.opensmog_quit("XML input error: dihedrals_type name \""+name.attrib['name']+"\" is used more than once in the OpenSMOG xml file.  The name of each dihedrals_type must be unique.")
-                        CDForce_Names.append(name.attrib['name'])
-
-                    for expr in dihedrals_xml[i].iter('expression'):
-                        CDExpression.append(expr.attrib['expr'])
-                        
-                    CDinternal_Param=[]
-                    for par in dihedrals_xml[i].iter('parameter'):
-                        CDinternal_Param.append(par.text)
-                    CDParameters.append(CDinternal_Param)
-
-                    internal_ijkl=[]
-                    for atoms_ijkl in dihedrals_xml[i].iter('interaction'):
-                            internal_ijkl.append(atoms_ijkl.attrib)
-                    ijkl.append(internal_ijkl)
-
                 xml_data['dihedrals']=[CDExpression,CDParameters,ijkl,CDForce_Names]
 
             return xml_data
 
-        result,log=validate(Xmlfile)
-        if not result:
-            SBM.opensmog_quit("The OpenSMOG xml file \""+Xmlfile+"\" does not adhere to the required schema. Check the end of this message for common causes of this error.\n\n  Detailed schema issue:\n"+str(log)+"\n\n  THE MOST COMMON CAUSES OF THIS ERROR ARE:\n    - You are using a version of SMOG 2 that is newer than this version of OpenSMOG. While force fields generated by older versions of SMOG 2 can be used with newer versions of OpenSMOG, the reverse is generally not possible. Try using the most recently released versions of both tools (or current git versions of both).\n    - Your xml file was corrupted. This can occur if you manually changed it, there was a file transfer error, or SMOG 2 crashed during writing.")
-        
-        self.data = import_xml2OpenSMOG(Xmlfile)
+        self.data = import_xml2OpenSMOG(parse_and_validate(Xmlfile))
         if self.contacts_present==True: 
             self._splitForces_contacts()
             for force in self.contacts:
@@ -1078,11 +1143,12 @@ dihedral information provided in the top and xml files.
             self._splitForces_nb()
             for force in self.nonbond:
                 print("        Creating Nonbonded force {:} from xml file.\n        This will replace any nonbonded definitions given in the .top file\n".format(force))
-                self._customSmogForce_nb(force, self.nonbond[force])
-                self.system.addForce(self.forcesDict['Nonbonded'+str(force)])
+                key = self._customSmogForce_nb(force, self.nonbond[force])
+                self.system.addForce(self.forcesDict[key])
             ## REMOVE OTHER NONBONDED FORCES
-            self.system.removeForce(0)
-            self.system.removeForce(0)
+            # remove from the highest index down, so the remaining indices are unaffected
+            for force_id in sorted(self._forcesToRemove, reverse=True):
+                self.system.removeForce(force_id)
         
     def addForce(self,force,name=None):
 
@@ -1140,18 +1206,17 @@ dihedral information provided in the top and xml files.
 
     def _checkFile(self,filename):   
         if os.path.isfile(filename):
-            i = 1
-            ck = True
-            while i <= 10 and ck:
-                newname = filename + "_" + str(i)
-                if not os.path.isfile(newname):
+            # list the directory once, rather than testing each backup name separately
+            basename = os.path.basename(filename)
+            existing = {e.name for e in os.scandir(os.path.dirname(filename) or '.')}
+            for i in range(1, 11):
+                if basename + "_" + str(i) not in existing:
+                    newname = filename + "_" + str(i)
                     print("{:} already exists.  Backing up to {:}".format(filename,newname))
                     os.rename(filename, newname)
-                    ck = False
-                else:
-                    i += 1
+                    break
 
-    def createReporters(self, trajectory=True, trajectoryName=None, trajectoryFormat='dcd', energies=True, energiesName=None, energy_components=False, energy_componentsName=None, logFileName='OpenSMOG.log', interval=1000,checkpoint=True,checkpointName='smog.chk', checkpointInterval=1000000):
+    def createReporters(self, trajectory=True, trajectoryName=None, trajectoryFormat='dcd', energies=True, energiesName=None, energy_components=False, energy_componentsName=None, logFileName='OpenSMOG.log', interval=1000,checkpoint=True,checkpointName='smog.chk', checkpointInterval=1000000, flushInterval=None):
         R"""Creates the reporters to provide the output data.
 
         Args:
@@ -1180,6 +1245,8 @@ dihedral information provided in the top and xml files.
                  Name of checkpoint file. (Default value: :code:`smog.chk`)
             checkpointInterval (int,optional)
                  Interval (in time steps) for writing checkpoint files (Default value: :code:`10**6`) 
+            flushInterval (int,optional)
+                 If given, the energies and energy_components reports are kept in memory and written to their files every flushInterval reports, rather than after every report. Kept reports are also written whenever a checkpoint is saved, and when run/runForClockTime returns. (Default value: :code:`None`)
         """
 
         if not self._createpassed:
@@ -1202,6 +1269,8 @@ dihedral information provided in the top and xml files.
         self.checkpointName=checkpointName
         if not isinstance(checkpointInterval,int):
             SBM.opensmog_quit('checkpointInterval must be an integer.')
+        if flushInterval is not None and (not isinstance(flushInterval,int) or flushInterval < 1):
+            SBM.opensmog_quit('flushInterval must be a positive integer.')
         checkpointName=os.path.join(self.folder, checkpointName)
         if checkpoint:
             self.simulation.reporters.append(CheckpointReporter(checkpointName, checkpointInterval)) 
@@ -1261,9 +1330,13 @@ Will try to import mdtraj...""")
                     energyfile = os.path.join(self.folder, energiesName + ".txt")
             self._checkFile(energyfile)
             self.outputNames.append(energyfile)
-            self.simulation.reporters.append(stateReporter(energyfile, interval, step=True, 
+            repor = stateReporter(energyfile, interval, step=True, 
                                                           potentialEnergy=True, kineticEnergy=True,
-                                                            totalEnergy=True,temperature=True, separator=","))
+                                                            totalEnergy=True,temperature=True, separator=",")
+            if flushInterval is not None:
+                repor = bufferedReporter(repor, flushInterval)
+                self._bufferedReporters.append(repor)
+            self.simulation.reporters.append(repor)
 
         if energy_components:
             if energy_componentsName is None:
@@ -1278,7 +1351,15 @@ Will try to import mdtraj...""")
 
             self._checkFile(forcefile)
             self.outputNames.append(forcefile)
-            self.simulation.reporters.append(forcesReporter(forcefile, interval, self.forcesDict, step=True))
+            repor = forcesReporter(forcefile, interval, self.forcesDict, step=True)
+            if flushInterval is not None:
+                repor = bufferedReporter(repor, flushInterval)
+                self._bufferedReporters.append(repor)
+            self.simulation.reporters.append(repor)
+
+        if checkpoint and flushInterval is not None:
+            # added last, so that the kept reports of a checkpoint step are written right after the checkpoint
+            self.simulation.reporters.append(flushReporter(self._bufferedReporters, checkpointInterval))
 
         
             
@@ -1308,7 +1389,11 @@ Will try to import mdtraj...""")
                 self.reporteradded=True
 
         self._createLogfile()                                                   
-        self.simulation.step(nsteps)
+        try:
+            self.simulation.step(nsteps)
+        finally:
+            # also write the kept reports if the simulation fails, since they are needed to find out why
+            self._flushReporters()
 
     def runForClockTime(self, time, report=True, interval=10**4,checkpointFile=None, stateFile=None, checkpointInterval=None):
 
@@ -1343,9 +1428,29 @@ Will try to import mdtraj...""")
                 self.reporteradded=True
 
         self._createLogfile()                                                   
-        self.simulation.runForClockTime(time=time,checkpointFile=checkpointFile, stateFile=stateFile, checkpointInterval=checkpointInterval)
+        try:
+            if checkpointInterval is None or not self._bufferedReporters:
+                self.simulation.runForClockTime(time=time,checkpointFile=checkpointFile, stateFile=stateFile, checkpointInterval=checkpointInterval)
+            else:
+                # run one checkpoint interval at a time, so that the kept reports are written after each checkpoint
+                import datetime
+                if is_quantity(time):
+                    time = time.value_in_unit(hours)
+                if is_quantity(checkpointInterval):
+                    checkpointInterval = checkpointInterval.value_in_unit(hours)
+                endTime = datetime.datetime.now()+datetime.timedelta(hours=time)
+                while datetime.datetime.now() < endTime:
+                    remaining = (endTime-datetime.datetime.now()).total_seconds()/3600
+                    self.simulation.runForClockTime(time=min(checkpointInterval,remaining),checkpointFile=checkpointFile, stateFile=stateFile)
+                    self._flushReporters()
+        finally:
+            self._flushReporters()
         print("\nOpenSMOG simulation completed.\n")
 
+    def _flushReporters(self):
+        for repor in self._bufferedReporters:
+            repor.flush()
+
     def _createLogfile(self):
         import platform
         import datetime
@@ -1354,91 +1459,82 @@ Will try to import mdtraj...""")
         self.outputNames.append(logFilename)
         if self.started == 1:
             # if this is the first time, then create a new file
-            wa='w'
+            wa='wb'
         else:
             # if run is called a second time, then append
-            wa='a'
+            wa='ab'
 
-        with open(logFilename, wa) as f:
-            ori = sys.stdout
-            sys.stdout = f
-            sys.stdout = ori
-        
         #system_information
-            f.write('\nComputation Information:\n')
-            f.write('-------------------\n')
-
-            f.write('Date and time: {:}\n'.format(datetime.datetime.now()))
-            f.write('Machine information: {:} : {:}, {:} : {:}\n'.format("System", platform.uname().system, "Version", platform.uname().version))
-            f.write('OpenSMOG version: {:}\n'.format(SBM.version))
-            f.write('Platform: {:}\n'.format(self.platform.getName()))
-            if (self.platform.getName() in ["CUDA", "OpenCL", "HIP"]):
-                f.write('Precision: {:}\n'.format(self.properties['Precision']))
-
-            f.write('\nSimulation Information:\n')
-            f.write('-----------------------\n')
-
-            f.write('Name: {:}\n'.format(self.name))
-            f.write('Time step: {:}\n'.format(self.dt/picoseconds))
-            f.write('Collision Rate: {:}\n'.format(self.gamma*picosecond))
-            f.write('r_cutoff: {:}\n'.format(self.rcutoff/nanometers))
-            f.write('Temperature: {:}\n'.format(self.temperature * 0.008314/kelvin))
-            f.write('Integrator: {:}\n'.format(self.integratorname))
-
-            f.write('\nInput Files:\n')
-            f.write('------------\n')
-            f.write('GroFile: {:}\n'.format(self.inputNames[0]))
-            f.write('TopFile: {:}\n'.format(self.inputNames[1]))
-            f.write('XmlFile: {:}\n'.format(self.inputNames[2]))
-
-            f.write('\nOutput Files:\n')
-            f.write('-------------\n')
-            f.write('Savefolder: {:}\n'.format(self.folder))
-            for n in self.outputNames:
-                f.write(os.path.basename(n)+"\n")
-
-            sys.stdout = ori
+        lines = ['\nComputation Information:\n',
+                 '-------------------\n',
+                 'Date and time: {:}\n'.format(datetime.datetime.now()),
+                 'Machine information: {:} : {:}, {:} : {:}\n'.format("System", platform.uname().system, "Version", platform.uname().version),
+                 'OpenSMOG version: {:}\n'.format(SBM.version),
+                 'Platform: {:}\n'.format(self.platform.getName())]
+        if (self.platform.getName() in ["CUDA", "OpenCL", "HIP"]):
+            lines.append('Precision: {:}\n'.format(self.properties['Precision']))
+
+        lines.append(_LOGTEMPLATE % (self.name, self.time_step, self.collision_rate, self.rcutoff.value_in_unit(nanometer),
+                                     self.temperature_reduced, self.integratorname,
+                                     self.inputNames[0], self.inputNames[1], self.inputNames[2], self.folder))
+        lines.extend(os.path.basename(n) + "\n" for n in self.outputNames)
+
+        # the file is opened in binary mode, so the whole text is encoded and written at once
+        with open(logFilename, wa) as f:
+            f.write("".join(lines).encode('utf-8'))
 
             
 #end of subroutines
 
 
-    print('{:^96s}'.format("****************************************************************************************"))
-    print('{:^96s}'.format("**** *** *** *** *** *** *** *** OpenSMOG (v"+version+") *** *** *** *** *** *** *** ****"))
-    print('')
+# The banner that is printed when OpenSMOG is loaded. It only depends on constants, so it is built once, at import.
+_bannerLines = ["****************************************************************************************",
+                "**** *** *** *** *** *** *** *** OpenSMOG (v"+SBM.version+") *** *** *** *** *** *** *** ****",
+                ""]
 
-    # this was added so that we can add additional information about the version, such as a git commit number, if desired
-    pt = os.path.dirname(os.path.realpath(__file__))
-    pt = pt+"/.versionnotes"
-    if os.path.exists(pt):
-        fh=open(pt,'r')
-        lines=fh.readlines()
-        for line in lines:
-            print('{:^96s}'.format(line.rstrip()))
-        
-    print('{:^96s}'.format("The OpenSMOG class is used to perform molecular dynamics simulations using"))
-    print('{:^96s}'.format("Structure-Based Models (SBM) for biomolecular systems,"))
-    print('{:^96s}'.format("and it allows for the simulation of a wide variety of potential forms."))
-    print('{:^96s}'.format("OpenSMOG uses force field files generated by SMOG 2."))
-    print('{:^96s}'.format("OpenSMOG documentation is available at"))
-    print('{:^96s}'.format("https://opensmog.readthedocs.io and https://smog-server.org"))
-    print('')
-    print('{:^96s}'.format("OpenSMOG is described in: Oliveira and Contessoto et al,"))
-    print('{:^96s}'.format("SMOG 2 and OpenSMOG: Extending the limits of structure-based models."))
-    print('{:^96s}'.format("Protein Science, 31, 158-172 (2022) DOI:10.1002/pro.4209"))
-    print('')
-    print('{:^96s}'.format("This package is the product of contributions from a number of people, including:"))
-    print('{:^96s}'.format("Jeffrey Noel, Mariana Levi, Antonio Oliveira, Vinícius Contessoto,"))
-    print('{:^96s}'.format("Esteban Dodero-Rojas, Mohit Raghunathan, Joyce Yang, Prasad Bandarkar,"))
-    print('{:^96s}'.format("Udayan Mohanty, Ailun Wang, Heiko Lammert, Ryan Hayes,"))
-    print('{:^96s}'.format("Jose Onuchic & Paul Whitford"))
-    print('')
-    print('{:^96s}'.format("Copyright (c) 2021, 2022, 2024 The SMOG development team at"))
-    print('{:^96s}'.format("Rice University and Northeastern University"))
-    print("\n\n")
-    print('{:^96s}'.format("For more information, including descriptions of units and examples of"))
-    print('{:^96s}'.format("how to launch a simulation with OpenSMOG, issue the command SBM.help()"))
-    print('{:^96s}'.format("To check your installation of OpenSMOG/SMOG2, use SBM.opensmogcheck()"))
-    print('{:^96s}'.format("Additional information available at https://smog-server.org"))
-    print('{:^96s}'.format("****************************************************************************************"))
-    sys.stdout.flush()
+# this was added so that we can add additional information about the version, such as a git commit number, if desired
+_versionnotes = os.path.join(os.path.dirname(os.path.realpath(__file__)), ".versionnotes")
+if os.path.exists(_versionnotes):
+    with open(_versionnotes,'r') as fh:
+        _bannerLines += [line.rstrip() for line in fh]
+
+_bannerLines += """\
+The OpenSMOG class is used to perform molecular dynamics simulations using
+Structure-Based Models (SBM) for biomolecular systems,
+and it allows for the simulation of a wide variety of potential forms.
+OpenSMOG uses force field files generated by SMOG 2.
+OpenSMOG documentation is available at
+https://opensmog.readthedocs.io and https://smog-server.org
+
+OpenSMOG is described in: Oliveira and Contessoto et al,
+SMOG 2 and OpenSMOG: Extending the limits of structure-based models.
+Protein Science, 31, 158-172 (2022) DOI:10.1002/pro.4209
+
+This package is the product of contributions from a number of people, including:
+Jeffrey Noel, Mariana Levi, Antonio Oliveira, Vinícius Contessoto,
+Esteban Dodero-Rojas, Mohit Raghunathan, Joyce Yang, Prasad Bandarkar,
+Udayan Mohanty, Ailun Wang, Heiko Lammert, Ryan Hayes,
+Jose Onuchic & Paul Whitford
+
+Copyright (c) 2021, 2022, 2024 The SMOG development team at
+Rice University and Northeastern University
+
+
+
+For more information, including descriptions of units and examples of
+how to launch a simulation with OpenSMOG, issue the command SBM.help()
+To check your installation of OpenSMOG/SMOG2, use SBM.opensmogcheck()
+Additional information available at https://smog-server.org
+****************************************************************************************""".split("\n")
+
+# centered lines of the banner. Blank lines are left empty, rather than padded to the banner width
+_HEADER_LINES = tuple('{:^96s}'.format(line) if line else line for line in _bannerLines)
+del _bannerLines
+_HEADER = "\n".join(_HEADER_LINES) + "\n"
+
+def printHeader():
+    # sys.stdout is looked up once, when the function is called
+    write = sys.stdout.write
+    write(_HEADER)
+
+printHeader()
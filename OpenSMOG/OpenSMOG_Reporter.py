@@ -22,6 +22,7 @@ except:
     print('Failed to load OpenMM. Check your configuration.')
     sys.exit(1)
 
+import io
 import time
 from sys import stdout
 
@@ -151,6 +152,73 @@ class stateReporter(StateDataReporter):
             values.append(value)
         return values
 
+class bufferedReporter(object):
+    R"""Wraps a :code:`StateDataReporter`-like reporter, so that its output is kept in memory and written to its file every :code:`flushInterval` reports, rather than flushed after every report.
+
+    Args:
+
+        reporter (StateDataReporter, required):
+            Reporter to be wrapped. It writes to an in-memory buffer while wrapped.
+        flushInterval (int, optional):
+            Number of reports that are accumulated before they are written to the file. (Default value: :code:`100`)
+    """
+    def __init__(self, reporter, flushInterval=100):
+        self._reporter = reporter
+        self._flushInterval = flushInterval
+        self._count = 0
+        self._file = reporter._out
+        self._buffer = io.StringIO()
+        reporter._out = self._buffer
+
+    def describeNextReport(self, simulation):
+        return self._reporter.describeNextReport(simulation)
+
+    def report(self, simulation, state):
+        self._reporter.report(simulation, state)
+        self._count += 1
+        if self._count >= self._flushInterval:
+            self.flush()
+
+    def flush(self):
+        # write the accumulated reports to the file
+        data = self._buffer.getvalue()
+        if data:
+            self._file.write(data)
+            self._buffer.seek(0)
+            self._buffer.truncate()
+        try:
+            self._file.flush()
+        except AttributeError:
+            pass
+        self._count = 0
+
+    def __del__(self):
+        self.flush()
+        if self._reporter._openedFile:
+            self._file.close()
+
+class flushReporter(object):
+    R"""Writes the reports kept by a list of :class:`bufferedReporter` objects to their files every :code:`reportInterval` steps. It is added after the other reporters, so that the energy files are complete up to each checkpoint.
+
+    Args:
+
+        reporters (list, required):
+            The :class:`bufferedReporter` objects to flush.
+        reportInterval (int, required):
+            The interval (in time steps) at which to flush the reporters.
+    """
+    def __init__(self, reporters, reportInterval):
+        self._reporters = reporters
+        self._reportInterval = reportInterval
+
+    def describeNextReport(self, simulation):
+        steps = self._reportInterval - simulation.currentStep%self._reportInterval
+        return (steps, False, False, False, False)
+
+    def report(self, simulation, state):
+        for repor in self._reporters:
+            repor.flush()
+
 class SMOGMinimizationReporter(MinimizationReporter):
 
     # From the OpenMM cookbook: you must override the report method and it must have this signature.
@@ -1,4 +1,4 @@
 __version__ = '1.2'
 # if you change __version__, remember to change SBM.version
-from .OpenSMOG_Reporter import forcesReporter, stateReporter
+from .OpenSMOG_Reporter import forcesReporter, stateReporter, bufferedReporter
 from .OpenSMOG import SBM